@@ -0,0 +1,154 @@
+import math
+from types import MappingProxyType
+
+import numpy as np
+import streamlit as st
+from numba import njit
+
+# --- Constants & Constants ---
+LHV = 43_000_000  
+CO2_FACTOR = 3.15 
+R = 287
+ETA_C = 0.88 # Compressor Eff
+ETA_T = 0.92 # Turbine Eff
+GAMMA_AIR = 1.4
+GAMMA_GAS = 1.33
+CP_AIR = 1005
+CP_GAS = 1150
+MATERIAL_LIMITS = MappingProxyType({"Stainless Steel": 950, "Inconel 718": 1350, "CMSX-4 Superalloy": 1900})
+RPM_MIN = 5000
+RPM_MAX = 16000
+RPM_DESIGN = 12000
+GRID_TIT = (float(min(MATERIAL_LIMITS.values())), 2200.0)
+GRID_N = 64
+
+# Gamma-only exponents, folded once at import instead of on every rerun
+K_AIR = (GAMMA_AIR - 1) / GAMMA_AIR      # 0.2857...
+K_AIR_NUM = GAMMA_AIR / (GAMMA_AIR - 1)  # 3.5, isentropic T -> p
+K_GAS = (GAMMA_GAS - 1) / GAMMA_GAS      # 0.2481...
+K_GAS_NUM = GAMMA_GAS / (GAMMA_GAS - 1)  # turbine exponent is K_GAS_NUM / eta_t
+K_RAM = (GAMMA_AIR - 1) / 2
+
+# --- Cached Physics ---
+# Streamlit reruns the whole script on every widget change, so the pure
+# math is memoized on its scalar inputs.
+
+@st.cache_data(max_entries=256)
+def ambient(alt):
+    t_amb = 288.15 - (0.00198 * alt)
+    p_amb = 101325 * math.pow(t_amb / 288.15, 5.256)
+    return t_amb, p_amb
+
+def material_limit(material):
+    return MATERIAL_LIMITS[material]
+
+@st.cache_resource(max_entries=16)
+def rpm_pr_table(ref_pr):
+    # Physics: PR scales with RPM squared. The slider is integer-valued, so the
+    # whole domain is tabulated once per design PR and indexed by rpm - RPM_MIN.
+    # cache_resource hands back the array itself (no copy), so it is frozen.
+    table = np.arange(RPM_MIN, RPM_MAX + 1) / RPM_DESIGN
+    table **= 2
+    table *= ref_pr - 1
+    table += 1
+    table.flags.writeable = False
+    return table
+
+@njit(cache=True)
+def cycle(t_amb, p_amb, mach, pr, tit, eta_c, eta_t):
+    v_flight = mach * math.sqrt(GAMMA_AIR * R * t_amb)
+
+    t2 = t_amb * (1 + K_RAM * mach**2)
+    p2 = p_amb * (t2 / t_amb)**K_AIR_NUM
+    t3 = t2 + (t2 * (pr**K_AIR) - t2) / eta_c
+    f = (CP_GAS * tit - CP_AIR * t3) / (0.98 * LHV - CP_GAS * tit)
+    t5 = tit - (CP_AIR * (t3 - t2)) / ((1 + f) * CP_GAS)
+    if t5 > 0:
+        p5 = (p2 * pr) * (t5 / tit)**(K_GAS_NUM / eta_t)
+        v_e = math.sqrt(max(0.0, 2 * CP_GAS * t5 * (1 - (p_amb/p5)**K_GAS)))
+    else:
+        # Turbine would need more work than the gas holds: no physical exit state
+        p5 = math.nan
+        v_e = math.nan
+
+    thrust_spec = (1 + f) * v_e - v_flight
+    # No positive thrust or no fuel burned: not a valid operating point
+    sfc = (f / thrust_spec) * 1_000_000 if thrust_spec > 0 and f > 0 else math.nan
+    return v_flight, t2, p2, t3, f, t5, p5, v_e, thrust_spec, sfc
+
+# Compile (or load from the on-disk cache) once per server process, at import.
+# The import happens inside the first script run, so that run still pays for it;
+# later runs and sessions reuse the compiled kernel.
+cycle(288.15, 101325.0, 0.0, 10.0, 1000.0, ETA_C, ETA_T)
+
+@st.cache_data(max_entries=256)
+def brayton(alt, mach, pr, tit, eta_c, eta_t):
+    t_amb, p_amb = ambient(alt)
+    v_flight, t2, p2, t3, f, t5, p5, v_e, thrust_spec, sfc = cycle(
+        float(t_amb), float(p_amb), float(mach), float(pr), float(tit), float(eta_c), float(eta_t))
+    return {
+        "t_amb": t_amb, "p_amb": p_amb, "v_flight": v_flight,
+        "t2": t2, "p2": p2, "t3": t3, "f": f, "t5": t5, "p5": p5, "v_e": v_e,
+        "thrust_spec": thrust_spec, "sfc": sfc,
+    }
+
+def cycle_grid(alt, mach, pr, tit, eta_c, eta_t):
+    # Vectorized twin of cycle(): pr and tit may be arrays broadcast together,
+    # everything downstream of the inlet is evaluated with in-place ufuncs.
+    t_amb, p_amb = ambient(alt)
+    v_flight = mach * math.sqrt(GAMMA_AIR * R * t_amb)
+    t2 = t_amb * (1 + K_RAM * mach * mach)
+    p2 = p_amb * math.pow(t2 / t_amb, K_AIR_NUM)
+    pr, tit = np.broadcast_arrays(np.asarray(pr, dtype=float), np.asarray(tit, dtype=float))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t3 = np.empty_like(pr)
+        np.power(pr, K_AIR, out=t3)
+        t3 *= t2
+        t3 -= t2
+        t3 /= eta_c
+        t3 += t2
+
+        f = CP_GAS * tit
+        den = 0.98 * LHV - f
+        f -= CP_AIR * t3
+        f /= den
+
+        t5 = t3 - t2
+        t5 *= CP_AIR / CP_GAS
+        t5 /= 1 + f
+        np.subtract(tit, t5, out=t5)
+
+        p5 = t5 / tit
+        np.power(p5, K_GAS_NUM / eta_t, out=p5)
+        p5 *= pr
+        p5 *= p2
+
+        v_e = np.divide(p_amb, p5)
+        np.power(v_e, K_GAS, out=v_e)
+        np.subtract(1, v_e, out=v_e)
+        v_e *= t5
+        v_e *= 2 * CP_GAS
+        np.maximum(v_e, 0.0, out=v_e)
+        np.sqrt(v_e, out=v_e)
+
+        thrust_spec = f + 1
+        thrust_spec *= v_e
+        thrust_spec -= v_flight
+        sfc = f / thrust_spec
+        sfc *= 1_000_000
+    # No positive thrust or no fuel burned: not a valid operating point
+    sfc[(thrust_spec <= 0) | (f <= 0)] = np.nan
+    return thrust_spec, sfc
+
+@st.cache_data(max_entries=64)
+def design_space(alt, mach, ref_pr, eta_c, eta_t):
+    # PR axis spans what the RPM slider can reach for this design PR, so the
+    # operating point always lands on the grid
+    table = rpm_pr_table(ref_pr)
+    pr_lo, pr_hi = float(table.min()), float(table.max())
+    pr = np.linspace(pr_lo, pr_hi if pr_hi > pr_lo else pr_lo + 1, GRID_N)
+    tit = np.linspace(*GRID_TIT, GRID_N)
+    PR, TIT = np.meshgrid(pr, tit)
+    _, sfc = cycle_grid(alt, mach, PR, TIT, eta_c, eta_t)
+    return PR, TIT, sfc
@@ -1,85 +1,133 @@
+import math
+
 import streamlit as st
+import matplotlib
+matplotlib.use("Agg") # headless: skip GUI backend resolution at import
+from matplotlib.figure import Figure
 import numpy as np
-import matplotlib.pyplot as plt
+import pandas as pd
 
-# --- Constants & Constants ---
-LHV = 43_000_000  
-CO2_FACTOR = 3.15 
-R = 287
+from aero_core import (
+    CO2_FACTOR, ETA_C, ETA_T, MATERIAL_LIMITS, RPM_DESIGN, RPM_MAX, RPM_MIN,
+    ambient, brayton, design_space, material_limit, rpm_pr_table,
+)
 
 st.set_page_config(page_title="AeroPropulse NPSS-Lite", layout="wide")
 st.title("🚀 AeroPropulse: High-Fidelity Coupled Simulator")
 
+def _session_memo(name, key, compute):
+    # Per-session memo on the exact input tuple: an unchanged panel skips even
+    # the st.cache_data hash-and-unpickle round trip.
+    if st.session_state.get(f"{name}_key") != key:
+        st.session_state[name] = compute(*key)
+        st.session_state[f"{name}_key"] = key
+    return st.session_state[name]
+
 # --- Sidebar Inputs ---
 with st.sidebar:
-    st.header("1. Operational Conditions")
-    alt = st.slider("Altitude (ft)", 0, 50000, 35000)
-    mach = st.slider("Flight Mach", 0.0, 2.0, 0.8)
+    # Widgets inside a form only trigger a rerun on submit
+    with st.form("design"):
+        st.header("1. Operational Conditions")
+        alt = st.slider("Altitude (ft)", 0, 50000, 35000)
+        mach = st.slider("Flight Mach", 0.0, 2.0, 0.8)
     
-    st.header("2. Mechanical Driver")
-    # RPM now drives the Mass Flow and Pressure Ratio
-    rpm = st.slider("Engine RPM", 5000, 16000, 12000)
-    material = st.selectbox("Turbine Material", ["Stainless Steel", "Inconel 718", "CMSX-4 Superalloy"])
+        st.header("2. Mechanical Driver")
+        # RPM now drives the Mass Flow and Pressure Ratio
+        rpm = st.slider("Engine RPM", RPM_MIN, RPM_MAX, RPM_DESIGN)
+        material = st.selectbox("Turbine Material", list(MATERIAL_LIMITS))
     
-    st.header("3. Thermodynamic Design")
-    target_tit = st.slider("Target TIT (K)", 1000, 2200, 1600)
-    ref_pr = st.number_input("Design Pressure Ratio (at 12k RPM)", value=25.0)
+        st.header("3. Thermodynamic Design")
+        target_tit = st.slider("Target TIT (K)", 1000, 2200, 1600)
+        ref_pr = st.number_input("Design Pressure Ratio (at 12k RPM)", value=25.0)
+
+        st.form_submit_button("Run")
 
 # --- THE COUPLED ENGINE CALCULATIONS ---
 
 # 1. Atmospheric Model
-t_amb = 288.15 - (0.00198 * alt)
-p_amb = 101325 * (t_amb / 288.15)**5.256
-v_flight = mach * np.sqrt(1.4 * R * t_amb)
+t_amb, p_amb = ambient(alt)
 
 # 2. Coupling: RPM to Pressure Ratio & Mass Flow
-rpm_ratio = rpm / 12000
-# Physics: PR scales with RPM squared
-current_pr = 1 + (ref_pr - 1) * (rpm_ratio**2)
+rpm_ratio = rpm / RPM_DESIGN
+# Physics: PR scales with RPM squared (tabulated per design PR)
+current_pr = float(rpm_pr_table(ref_pr)[rpm - RPM_MIN])
 # Physics: Mass flow scales with RPM and Air Density
 m_dot = 100 * rpm_ratio * (p_amb / 101325)
 
 # 3. Coupling: Material Safety Throttle (The FADEC logic)
-limits = {"Stainless Steel": 950, "Inconel 718": 1350, "CMSX-4 Superalloy": 1900}
-actual_tit = min(target_tit, limits[material])
+tit_limit = material_limit(material)
+actual_tit = min(target_tit, tit_limit)
 
 # 4. Cycle Analysis
-t2 = t_amb * (1 + 0.2 * mach**2)
-p2 = p_amb * (t2 / t_amb)**3.5
-t3 = t2 + (t2 * (current_pr**0.285) - t2) / 0.88 # 0.88 = Compressor Eff
-f = (1150 * actual_tit - 1005 * t3) / (0.98 * LHV - 1150 * actual_tit)
-t5 = actual_tit - (1005 * (t3 - t2)) / ((1 + f) * 1150)
-p5 = (p2 * current_pr) * (t5 / actual_tit)**(1.33 / (0.33 * 0.92)) # 0.92 = Turbine Eff
-v_e = np.sqrt(max(0, 2 * 1150 * t5 * (1 - (p_amb/p5)**0.248)))
+cycle = _session_memo("cycle", (alt, mach, current_pr, actual_tit, ETA_C, ETA_T), brayton)
+v_flight, v_e = cycle["v_flight"], cycle["v_e"]
+t2, t3, t5, f = cycle["t2"], cycle["t3"], cycle["t5"], cycle["f"]
 
 # 5. Output Metrics
-thrust = m_dot * ((1 + f) * v_e - v_flight)
-sfc = (f / ((1 + f) * v_e - v_flight)) * 1_000_000 
+thrust = m_dot * cycle["thrust_spec"]
+sfc = cycle["sfc"]
 co2_hr = (f * m_dot * 3600) * CO2_FACTOR
+# Compressor exit at or above TIT: the combustor has nothing to add, no fuel burns
+no_fuel = f <= 0
 
 # --- Dashboard Display ---
 c1, c2, c3, c4 = st.columns(4)
-c1.metric("Net Thrust", f"{round(thrust/1000, 2)} kN")
-c2.metric("SFC", f"{round(sfc, 2)} mg/Ns")
-c3.metric("Operating PR", f"{round(current_pr, 1)}")
-c4.metric("CO2 Emission", f"{round(co2_hr/1000, 2)} T/hr")
+c1.metric("Net Thrust", "—" if math.isnan(thrust) else f"{thrust/1000:.2f} kN")
+c2.metric("SFC", "—" if math.isnan(sfc) else f"{sfc:.2f} mg/Ns")
+c3.metric("Operating PR", f"{current_pr:.1f}")
+c4.metric("CO2 Emission", "—" if no_fuel or math.isnan(sfc) else f"{co2_hr/1000:.2f} T/hr")
 
 if actual_tit < target_tit:
     st.error(f"⚠️ SAFETY LIMIT ACTIVE: {material} cannot handle {target_tit}K. Throttled to {actual_tit}K.")
 
+if no_fuel:
+    st.error(f"⚠️ NO COMBUSTION: compressor exit ({t3:.0f}K) is at or above the turbine inlet temperature ({actual_tit}K), so no fuel is burned.")
+elif math.isnan(sfc):
+    st.error("⚠️ NON-PHYSICAL OPERATING POINT: the engine produces no positive net thrust at these settings.")
+
 st.divider()
 
 # Visualization
+# Tiny plots go to Streamlit's client-side charts; matplotlib is kept for the contour
 col_a, col_b = st.columns(2)
 with col_a:
     st.subheader("Velocity Vectors")
-    fig, ax = plt.subplots()
-    ax.barh(['Inlet Velocity', 'Exhaust Velocity'], [v_flight, v_e], color=['#2ecc71', '#e67e22'])
-    st.pyplot(fig)
+    # A colour column keeps the baseline per-bar colours without a legend
+    velocities = pd.DataFrame(
+        {"Velocity (m/s)": [v_flight, v_e], "colour": ['#2ecc71', '#e67e22']},
+        index=['Inlet Velocity', 'Exhaust Velocity'],
+    )
+    st.bar_chart(velocities, y="Velocity (m/s)", color="colour", horizontal=True, sort=False)
     
 
 with col_b:
     st.subheader("Thermal Envelope")
-    fig2, ax2 = plt.subplots()
-    ax2.plot(['Amb', 'Inlet', 'Comp', 'TIT', 'Turbine'], [t_amb, t2, t3, actual_tit, t5], marker='D', ls='--', color='blue')
-    st.pyplot(fig2)
\ No newline at end of file
+    # An ordered categorical index keeps flow order on the chart's category axis
+    labels = ['Amb', 'Inlet', 'Comp', 'TIT', 'Turbine']
+    stations = pd.CategoricalIndex(labels, categories=labels, ordered=True)
+    # A non-positive turbine exit has no physical state; leave that point off
+    st.line_chart(pd.DataFrame({"T (K)": [t_amb, t2, t3, actual_tit, t5 if t5 > 0 else math.nan]}, index=stations))
+
+st.divider()
+st.subheader("Design Space: SFC (mg/Ns) vs PR & TIT")
+PR, TIT, sfc_grid = _session_memo("design_space", (alt, mach, ref_pr, ETA_C, ETA_T), design_space)
+# Near-zero-thrust corners blow SFC up by orders of magnitude; clip the colour
+# scale to the bulk of the grid so the useful region keeps its resolution.
+sfc_valid = sfc_grid[np.isfinite(sfc_grid)]
+sfc_lo, sfc_hi = np.percentile(sfc_valid, [0, 90]) if sfc_valid.size else (0.0, 0.0)
+if sfc_hi <= sfc_lo:
+    st.info("No valid operating points in the design space at these settings.")
+else:
+    # Built per run: sessions execute on separate threads and matplotlib figures
+    # are not thread-safe, so a shared cached Figure would interleave between users.
+    # Figure() stays out of pyplot's global figure registry, so nothing to close.
+    fig3 = Figure(figsize=(10, 4))
+    ax3 = fig3.subplots()
+    cs = ax3.contourf(PR, TIT, sfc_grid, levels=np.linspace(sfc_lo, sfc_hi, 21), cmap='viridis', extend='max')
+    fig3.colorbar(cs, ax=ax3)
+    ax3.axhline(tit_limit, color='red', ls='--', label=f'{material} limit')
+    ax3.plot(current_pr, actual_tit, marker='*', ms=14, color='white', mec='black', ls='', label='Operating point')
+    ax3.set_xlabel('Pressure Ratio')
+    ax3.set_ylabel('TIT (K)')
+    ax3.legend(loc='lower right')
+    st.pyplot(fig3)